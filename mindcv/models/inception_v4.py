@@ -3,13 +3,15 @@ MindSpore implementation of `InceptionV4`.
 Refer to Inception-v4, Inception-ResNet and the Impact of Residual Connections on Learning.
 """
 
-from typing import Union, Tuple
+from typing import List, Tuple, Union
 
-from mindspore import nn, ops, Tensor
+from mindspore import nn, ops, export, load_param_into_net, Parameter, Tensor
+from mindspore import dtype as mstype
 import mindspore.common.initializer as init
 
 from .utils import load_pretrained
 from .registry import register_model
+from .layers.identity import Identity
 from .layers.pooling import GlobalAvgPooling
 
 __all__ = [
@@ -41,12 +43,13 @@ class BasicConv2d(nn.Cell):
                  kernel_size: Union[int, Tuple] = 1,
                  stride: int = 1,
                  padding: int = 0,
-                 pad_mode: str = 'same'
+                 pad_mode: str = 'same',
+                 data_format: str = 'NCHW'
                  ) -> None:
         super().__init__()
         self.conv = nn.Conv2d(in_channels, out_channels, kernel_size, stride,
-                              padding=padding, pad_mode=pad_mode)
-        self.bn = nn.BatchNorm2d(out_channels, eps=0.001, momentum=0.9997)
+                              padding=padding, pad_mode=pad_mode, data_format=data_format)
+        self.bn = nn.BatchNorm2d(out_channels, eps=0.001, momentum=0.9997, data_format=data_format)
         self.relu = nn.ReLU()
 
     def construct(self, x: Tensor) -> Tensor:
@@ -55,32 +58,74 @@ class BasicConv2d(nn.Cell):
         x = self.relu(x)
         return x
 
+    def fuse(self) -> None:
+        """Fold the batch norm into the conv weight and bias."""
+        if isinstance(self.bn, Identity):
+            return
+        scale = self.bn.gamma / ops.sqrt(self.bn.moving_variance + self.bn.eps)
+        bias = self.bn.beta - self.bn.moving_mean * scale
+        if self.conv.has_bias:
+            bias = bias + self.conv.bias * scale
+        self.conv.weight.set_data(self.conv.weight * ops.reshape(scale, (-1, 1, 1, 1)))
+        self.conv.bias = Parameter(bias, name=self.conv.weight.name[:-len('weight')] + 'bias')
+        self.conv.has_bias = True
+        self.bn = Identity()
+
+
+def _merge_heads(heads: List[BasicConv2d], data_format: str) -> nn.Conv2d:
+    """Merge the folded 1x1 convs of `heads`, which all read the same input, into one conv and leave only the
+    ReLU in each head. The pooled head of an Inception block may take its folded bias before the pooling because
+    'same' average pooling excludes the padding."""
+    weight = ops.concat([head.conv.weight for head in heads], axis=0)
+    bias = ops.concat([head.conv.bias for head in heads], axis=0)
+    in_channels = heads[0].conv.in_channels
+    conv = nn.Conv2d(in_channels, weight.shape[0], 1, has_bias=True, data_format=data_format)
+    conv.weight.set_data(weight)
+    conv.bias.set_data(bias)
+    for head in heads:
+        head.conv = Identity()
+    return conv
+
+
+def _split_channels(x: Tensor, channels: Tuple[int, ...], axis: int) -> Tuple[Tensor, ...]:
+    """Split `x` into consecutive chunks of `channels` along the channel axis."""
+    outs = ()
+    start = 0
+    for c in channels:
+        outs += (x[:, start:start + c] if axis == 1 else x[:, :, :, start:start + c],)
+        start += c
+    return outs
+
 
 class Stem(nn.Cell):
     """Inception V4 model blocks."""
-    def __init__(self, in_channels: int) -> None:
+    def __init__(self, in_channels: int, data_format: str = 'NCHW') -> None:
         super().__init__()
-        self.conv2d_1a_3x3 = BasicConv2d(in_channels, 32, kernel_size=3, stride=2, pad_mode='valid')
-        self.conv2d_2a_3x3 = BasicConv2d(32, 32, kernel_size=3, stride=1, pad_mode='valid')
-        self.conv2d_2b_3x3 = BasicConv2d(32, 64, kernel_size=3, stride=1, pad_mode='pad', padding=1)
+        self.channel_axis = 1 if data_format == 'NCHW' else 3
+        self.conv2d_1a_3x3 = BasicConv2d(in_channels, 32, kernel_size=3, stride=2, pad_mode='valid',
+                                         data_format=data_format)
+        self.conv2d_2a_3x3 = BasicConv2d(32, 32, kernel_size=3, stride=1, pad_mode='valid', data_format=data_format)
+        self.conv2d_2b_3x3 = BasicConv2d(32, 64, kernel_size=3, stride=1, pad_mode='pad', padding=1,
+                                         data_format=data_format)
 
-        self.mixed_3a_branch_0 = nn.MaxPool2d(3, stride=2)
-        self.mixed_3a_branch_1 = BasicConv2d(64, 96, kernel_size=3, stride=2, pad_mode='valid')
+        self.mixed_3a_branch_0 = nn.MaxPool2d(3, stride=2, data_format=data_format)
+        self.mixed_3a_branch_1 = BasicConv2d(64, 96, kernel_size=3, stride=2, pad_mode='valid', data_format=data_format)
 
         self.mixed_4a_branch_0 = nn.SequentialCell([
-            BasicConv2d(160, 64, kernel_size=1, stride=1),
-            BasicConv2d(64, 96, kernel_size=3, stride=1, pad_mode='valid')
+            BasicConv2d(160, 64, kernel_size=1, stride=1, data_format=data_format),
+            BasicConv2d(64, 96, kernel_size=3, stride=1, pad_mode='valid', data_format=data_format)
         ])
 
         self.mixed_4a_branch_1 = nn.SequentialCell([
-            BasicConv2d(160, 64, kernel_size=1, stride=1),
-            BasicConv2d(64, 64, kernel_size=(1, 7), stride=1),
-            BasicConv2d(64, 64, kernel_size=(7, 1), stride=1),
-            BasicConv2d(64, 96, kernel_size=3, stride=1, pad_mode='valid')
+            BasicConv2d(160, 64, kernel_size=1, stride=1, data_format=data_format),
+            BasicConv2d(64, 64, kernel_size=(1, 7), stride=1, data_format=data_format),
+            BasicConv2d(64, 64, kernel_size=(7, 1), stride=1, data_format=data_format),
+            BasicConv2d(64, 96, kernel_size=3, stride=1, pad_mode='valid', data_format=data_format)
         ])
 
-        self.mixed_5a_branch_0 = BasicConv2d(192, 192, kernel_size=3, stride=2, pad_mode='valid')
-        self.mixed_5a_branch_1 = nn.MaxPool2d(3, stride=2)
+        self.mixed_5a_branch_0 = BasicConv2d(192, 192, kernel_size=3, stride=2, pad_mode='valid',
+                                             data_format=data_format)
+        self.mixed_5a_branch_1 = nn.MaxPool2d(3, stride=2, data_format=data_format)
 
     def construct(self, x: Tensor) -> Tensor:
         x = self.conv2d_1a_3x3(x)  # 149 x 149 x 32
@@ -89,156 +134,181 @@ class Stem(nn.Cell):
 
         x0 = self.mixed_3a_branch_0(x)
         x1 = self.mixed_3a_branch_1(x)
-        x = ops.concat((x0, x1), axis=1)  # 73 x 73 x 160
+        x = ops.concat((x0, x1), axis=self.channel_axis)  # 73 x 73 x 160
 
         x0 = self.mixed_4a_branch_0(x)
         x1 = self.mixed_4a_branch_1(x)
-        x = ops.concat((x0, x1), axis=1)  # 71 x 71 x 192
+        x = ops.concat((x0, x1), axis=self.channel_axis)  # 71 x 71 x 192
 
         x0 = self.mixed_5a_branch_0(x)
         x1 = self.mixed_5a_branch_1(x)
-        x = ops.concat((x0, x1), axis=1)  # 35 x 35 x 384
+        x = ops.concat((x0, x1), axis=self.channel_axis)  # 35 x 35 x 384
         return x
 
 
-class InceptionA(nn.Cell):
-    """Inception V4 model basic architecture"""
-    def __init__(self) -> None:
+class InceptionBase(nn.Cell):
+    """Inception V4 block whose four branches each start with a 1x1 conv on the block input"""
+    def __init__(self, data_format: str = 'NCHW') -> None:
         super().__init__()
-        self.branch_0 = BasicConv2d(384, 96, kernel_size=1, stride=1)
+        self.channel_axis = 1 if data_format == 'NCHW' else 3
+        self.reduce = None
+        self.head_channels = ()
+
+    def heads(self) -> List[BasicConv2d]:
+        """The 1x1 convs reading the block input, in branch order."""
+        return [self.branch_0, self.branch_1[0], self.branch_2[0], self.branch_3[1]]
+
+    def branch_inputs(self, x: Tensor) -> Tuple[Tensor, ...]:
+        """The input of each branch, split from the merged 1x1 conv output once the block is fused."""
+        if self.reduce is not None:
+            return _split_channels(self.reduce(x), self.head_channels, self.channel_axis)
+        return x, x, x, x
+
+    def construct(self, x: Tensor) -> Tensor:
+        x0, x1, x2, x3 = self.branch_inputs(x)
+        x0 = self.branch_0(x0)
+        x1 = self.branch_1(x1)
+        x2 = self.branch_2(x2)
+        x3 = self.branch_3(x3)
+        x4 = ops.concat((x0, x1, x2, x3), axis=self.channel_axis)
+        return x4
+
+    def fuse(self) -> None:
+        """Compute the 1x1 convs that read the block input with a single conv."""
+        if self.reduce is not None:
+            return
+        heads = self.heads()
+        self.head_channels = tuple(head.conv.out_channels for head in heads)
+        self.reduce = _merge_heads(heads, 'NCHW' if self.channel_axis == 1 else 'NHWC')
+
+
+class InceptionA(InceptionBase):
+    """Inception V4 model basic architecture"""
+    def __init__(self, data_format: str = 'NCHW') -> None:
+        super().__init__(data_format)
+        self.branch_0 = BasicConv2d(384, 96, kernel_size=1, stride=1, data_format=data_format)
         self.branch_1 = nn.SequentialCell([
-            BasicConv2d(384, 64, kernel_size=1, stride=1),
-            BasicConv2d(64, 96, kernel_size=3, stride=1, pad_mode='pad', padding=1)
+            BasicConv2d(384, 64, kernel_size=1, stride=1, data_format=data_format),
+            BasicConv2d(64, 96, kernel_size=3, stride=1, pad_mode='pad', padding=1, data_format=data_format)
         ])
         self.branch_2 = nn.SequentialCell([
-            BasicConv2d(384, 64, kernel_size=1, stride=1),
-            BasicConv2d(64, 96, kernel_size=3, stride=1, pad_mode='pad', padding=1),
-            BasicConv2d(96, 96, kernel_size=3, stride=1, pad_mode='pad', padding=1)
+            BasicConv2d(384, 64, kernel_size=1, stride=1, data_format=data_format),
+            BasicConv2d(64, 96, kernel_size=3, stride=1, pad_mode='pad', padding=1, data_format=data_format),
+            BasicConv2d(96, 96, kernel_size=3, stride=1, pad_mode='pad', padding=1, data_format=data_format)
         ])
         self.branch_3 = nn.SequentialCell([
-            nn.AvgPool2d(kernel_size=3, stride=1, pad_mode='same'),
-            BasicConv2d(384, 96, kernel_size=1, stride=1)
+            nn.AvgPool2d(kernel_size=3, stride=1, pad_mode='same', data_format=data_format),
+            BasicConv2d(384, 96, kernel_size=1, stride=1, data_format=data_format)
         ])
 
-    def construct(self, x: Tensor) -> Tensor:
-        x0 = self.branch_0(x)
-        x1 = self.branch_1(x)
-        x2 = self.branch_2(x)
-        x3 = self.branch_3(x)
-        x4 = ops.concat((x0, x1, x2, x3), axis=1)
-        return x4
 
-
-class InceptionB(nn.Cell):
+class InceptionB(InceptionBase):
     """Inception V4 model basic architecture"""
-    def __init__(self) -> None:
-        super().__init__()
-        self.branch_0 = BasicConv2d(1024, 384, kernel_size=1, stride=1)
+    def __init__(self, data_format: str = 'NCHW') -> None:
+        super().__init__(data_format)
+        self.branch_0 = BasicConv2d(1024, 384, kernel_size=1, stride=1, data_format=data_format)
         self.branch_1 = nn.SequentialCell([
-            BasicConv2d(1024, 192, kernel_size=1, stride=1),
-            BasicConv2d(192, 224, kernel_size=(1, 7), stride=1),
-            BasicConv2d(224, 256, kernel_size=(7, 1), stride=1),
+            BasicConv2d(1024, 192, kernel_size=1, stride=1, data_format=data_format),
+            BasicConv2d(192, 224, kernel_size=(1, 7), stride=1, data_format=data_format),
+            BasicConv2d(224, 256, kernel_size=(7, 1), stride=1, data_format=data_format),
         ])
         self.branch_2 = nn.SequentialCell([
-            BasicConv2d(1024, 192, kernel_size=1, stride=1),
-            BasicConv2d(192, 192, kernel_size=(7, 1), stride=1),
-            BasicConv2d(192, 224, kernel_size=(1, 7), stride=1),
-            BasicConv2d(224, 224, kernel_size=(7, 1), stride=1),
-            BasicConv2d(224, 256, kernel_size=(1, 7), stride=1)
+            BasicConv2d(1024, 192, kernel_size=1, stride=1, data_format=data_format),
+            BasicConv2d(192, 192, kernel_size=(7, 1), stride=1, data_format=data_format),
+            BasicConv2d(192, 224, kernel_size=(1, 7), stride=1, data_format=data_format),
+            BasicConv2d(224, 224, kernel_size=(7, 1), stride=1, data_format=data_format),
+            BasicConv2d(224, 256, kernel_size=(1, 7), stride=1, data_format=data_format)
         ])
         self.branch_3 = nn.SequentialCell([
-            nn.AvgPool2d(kernel_size=3, stride=1, pad_mode='same'),
-            BasicConv2d(1024, 128, kernel_size=1, stride=1)
+            nn.AvgPool2d(kernel_size=3, stride=1, pad_mode='same', data_format=data_format),
+            BasicConv2d(1024, 128, kernel_size=1, stride=1, data_format=data_format)
         ])
 
-    def construct(self, x: Tensor) -> Tensor:
-        x0 = self.branch_0(x)
-        x1 = self.branch_1(x)
-        x2 = self.branch_2(x)
-        x3 = self.branch_3(x)
-        x4 = ops.concat((x0, x1, x2, x3), axis=1)
-        return x4
-
 
 class ReductionA(nn.Cell):
     """Inception V4 model Residual Connections"""
-    def __init__(self) -> None:
+    def __init__(self, data_format: str = 'NCHW') -> None:
         super().__init__()
-        self.branch_0 = BasicConv2d(384, 384, kernel_size=3, stride=2, pad_mode='valid')
+        self.channel_axis = 1 if data_format == 'NCHW' else 3
+        self.branch_0 = BasicConv2d(384, 384, kernel_size=3, stride=2, pad_mode='valid', data_format=data_format)
         self.branch_1 = nn.SequentialCell([
-            BasicConv2d(384, 192, kernel_size=1, stride=1),
-            BasicConv2d(192, 224, kernel_size=3, stride=1, pad_mode='pad', padding=1),
-            BasicConv2d(224, 256, kernel_size=3, stride=2, pad_mode='valid'),
+            BasicConv2d(384, 192, kernel_size=1, stride=1, data_format=data_format),
+            BasicConv2d(192, 224, kernel_size=3, stride=1, pad_mode='pad', padding=1, data_format=data_format),
+            BasicConv2d(224, 256, kernel_size=3, stride=2, pad_mode='valid', data_format=data_format),
         ])
-        self.branch_2 = nn.MaxPool2d(3, stride=2)
+        self.branch_2 = nn.MaxPool2d(3, stride=2, data_format=data_format)
 
     def construct(self, x: Tensor) -> Tensor:
         x0 = self.branch_0(x)
         x1 = self.branch_1(x)
         x2 = self.branch_2(x)
-        x3 = ops.concat((x0, x1, x2), axis=1)
+        x3 = ops.concat((x0, x1, x2), axis=self.channel_axis)
         return x3
 
 
 class ReductionB(nn.Cell):
     """Inception V4 model Residual Connections"""
-    def __init__(self) -> None:
+    def __init__(self, data_format: str = 'NCHW') -> None:
         super().__init__()
+        self.channel_axis = 1 if data_format == 'NCHW' else 3
         self.branch_0 = nn.SequentialCell([
-            BasicConv2d(1024, 192, kernel_size=1, stride=1),
-            BasicConv2d(192, 192, kernel_size=3, stride=2, pad_mode='valid'),
+            BasicConv2d(1024, 192, kernel_size=1, stride=1, data_format=data_format),
+            BasicConv2d(192, 192, kernel_size=3, stride=2, pad_mode='valid', data_format=data_format),
         ])
         self.branch_1 = nn.SequentialCell([
-            BasicConv2d(1024, 256, kernel_size=1, stride=1),
-            BasicConv2d(256, 256, kernel_size=(1, 7), stride=1),
-            BasicConv2d(256, 320, kernel_size=(7, 1), stride=1),
-            BasicConv2d(320, 320, kernel_size=3, stride=2, pad_mode='valid')
+            BasicConv2d(1024, 256, kernel_size=1, stride=1, data_format=data_format),
+            BasicConv2d(256, 256, kernel_size=(1, 7), stride=1, data_format=data_format),
+            BasicConv2d(256, 320, kernel_size=(7, 1), stride=1, data_format=data_format),
+            BasicConv2d(320, 320, kernel_size=3, stride=2, pad_mode='valid', data_format=data_format)
         ])
-        self.branch_2 = nn.MaxPool2d(3, stride=2)
+        self.branch_2 = nn.MaxPool2d(3, stride=2, data_format=data_format)
 
     def construct(self, x: Tensor) -> Tensor:
         x0 = self.branch_0(x)
         x1 = self.branch_1(x)
         x2 = self.branch_2(x)
-        x3 = ops.concat((x0, x1, x2), axis=1)
+        x3 = ops.concat((x0, x1, x2), axis=self.channel_axis)
         return x3  # 8 x 8 x 1536
 
 
-class InceptionC(nn.Cell):
+class InceptionC(InceptionBase):
     """Inception V4 model basic architecture"""
-    def __init__(self) -> None:
-        super().__init__()
-        self.branch_0 = BasicConv2d(1536, 256, kernel_size=1, stride=1)
+    def __init__(self, data_format: str = 'NCHW') -> None:
+        super().__init__(data_format)
+        self.branch_0 = BasicConv2d(1536, 256, kernel_size=1, stride=1, data_format=data_format)
 
-        self.branch_1 = BasicConv2d(1536, 384, kernel_size=1, stride=1)
-        self.branch_1_1 = BasicConv2d(384, 256, kernel_size=(1, 3), stride=1)
-        self.branch_1_2 = BasicConv2d(384, 256, kernel_size=(3, 1), stride=1)
+        self.branch_1 = BasicConv2d(1536, 384, kernel_size=1, stride=1, data_format=data_format)
+        self.branch_1_1 = BasicConv2d(384, 256, kernel_size=(1, 3), stride=1, data_format=data_format)
+        self.branch_1_2 = BasicConv2d(384, 256, kernel_size=(3, 1), stride=1, data_format=data_format)
 
         self.branch_2 = nn.SequentialCell([
-            BasicConv2d(1536, 384, kernel_size=1, stride=1),
-            BasicConv2d(384, 448, kernel_size=(3, 1), stride=1),
-            BasicConv2d(448, 512, kernel_size=(1, 3), stride=1),
+            BasicConv2d(1536, 384, kernel_size=1, stride=1, data_format=data_format),
+            BasicConv2d(384, 448, kernel_size=(3, 1), stride=1, data_format=data_format),
+            BasicConv2d(448, 512, kernel_size=(1, 3), stride=1, data_format=data_format),
         ])
-        self.branch_2_1 = BasicConv2d(512, 256, kernel_size=(1, 3), stride=1)
-        self.branch_2_2 = BasicConv2d(512, 256, kernel_size=(3, 1), stride=1)
+        self.branch_2_1 = BasicConv2d(512, 256, kernel_size=(1, 3), stride=1, data_format=data_format)
+        self.branch_2_2 = BasicConv2d(512, 256, kernel_size=(3, 1), stride=1, data_format=data_format)
 
         self.branch_3 = nn.SequentialCell([
-            nn.AvgPool2d(kernel_size=3, stride=1, pad_mode='same'),
-            BasicConv2d(1536, 256, kernel_size=1, stride=1)
+            nn.AvgPool2d(kernel_size=3, stride=1, pad_mode='same', data_format=data_format),
+            BasicConv2d(1536, 256, kernel_size=1, stride=1, data_format=data_format)
         ])
 
     def construct(self, x: Tensor) -> Tensor:
-        x0 = self.branch_0(x)
-        x1 = self.branch_1(x)
+        x0, x1, x2, x3 = self.branch_inputs(x)
+        x0 = self.branch_0(x0)
+        x1 = self.branch_1(x1)
         x1_1 = self.branch_1_1(x1)
         x1_2 = self.branch_1_2(x1)
-        x1 = ops.concat((x1_1, x1_2), axis=1)
-        x2 = self.branch_2(x)
+        x2 = self.branch_2(x2)
         x2_1 = self.branch_2_1(x2)
         x2_2 = self.branch_2_2(x2)
-        x2 = ops.concat((x2_1, x2_2), axis=1)
-        x3 = self.branch_3(x)
-        return ops.concat((x0, x1, x2, x3), axis=1)
+        x3 = self.branch_3(x3)
+        # a single concat writes every branch output once instead of copying x1 and x2 twice
+        return ops.concat((x0, x1_1, x1_2, x2_1, x2_2, x3), axis=self.channel_axis)
+
+    def heads(self) -> List[BasicConv2d]:
+        return [self.branch_0, self.branch_1, self.branch_2[0], self.branch_3[1]]
 
 
 class InceptionV4(nn.Cell):
@@ -249,44 +319,122 @@ class InceptionV4(nn.Cell):
         num_classes: number of classification classes. Default: 1000.
         in_channels: number the channels of the input. Default: 3.
         drop_rate: dropout rate of the layer before main classifier. Default: 0.2.
+        data_format: memory layout of the feature maps, 'NCHW' or 'NHWC'. The input is always NCHW and is
+            transposed once at the entry when 'NHWC' is used. 'NHWC' is only supported on GPU. Default: 'NCHW'.
+        dtype: compute type of the convolutions, e.g. mstype.float16 to run them on Tensor Cores or Cube units.
+            The batch norms and the classifier stay in float32. Default: mstype.float32.
+        skip_init: skip the Xavier initialization of the convs, e.g. when pretrained weights overwrite them anyway.
+            The classifier keeps its default initializer either way. Default: False.
     """
 
     def __init__(self,
                  num_classes: int = 1000,
                  in_channels: int = 3,
-                 drop_rate: float = 0.2
+                 drop_rate: float = 0.2,
+                 data_format: str = 'NCHW',
+                 dtype: mstype.Type = mstype.float32,
+                 skip_init: bool = False
                  ) -> None:
         super().__init__()
-        blocks = [Stem(in_channels)]
-        for _ in range(4):
-            blocks.append(InceptionA())
-        blocks.append(ReductionA())
-        for _ in range(7):
-            blocks.append(InceptionB())
-        blocks.append(ReductionB())
-        for _ in range(3):
-            blocks.append(InceptionC())
-        self.features = nn.SequentialCell(blocks)
-
-        self.pool = GlobalAvgPooling()
+        if data_format not in ('NCHW', 'NHWC'):
+            raise ValueError(f"Unsupported data_format '{data_format}', expected 'NCHW' or 'NHWC'.")
+        self.num_classes = num_classes
+        self.in_channels = in_channels
+        self.data_format = data_format
+        self.dtype = dtype
+        self.fused = False
+        self.features = nn.SequentialCell(
+            [Stem(in_channels, data_format)]
+            + [InceptionA(data_format) for _ in range(4)]
+            + [ReductionA(data_format)]
+            + [InceptionB(data_format) for _ in range(7)]
+            + [ReductionB(data_format)]
+            + [InceptionC(data_format) for _ in range(3)]
+        )
+
+        self.pool = GlobalAvgPooling(data_format=data_format)
         self.dropout = nn.Dropout(1 - drop_rate)
         self.num_features = 1536
         self.classifier = nn.Dense(self.num_features, num_classes)
-        self._initialize_weights()
+        if not skip_init:
+            self._initialize_weights()
+        if dtype != mstype.float32:
+            self._set_compute_type()
 
     def _initialize_weights(self) -> None:
         """Initialize weights for cells."""
         for _, cell in self.cells_and_names():
-            if isinstance(cell, nn.Conv2d):
+            if isinstance(cell, nn.Conv2d) and self.data_format == 'NHWC':
+                # draw the kernel as (out, in, h, w) for the right Xavier fans, then store it channels-last
+                out_channels, kernel_h, kernel_w, in_channels = cell.weight.shape
+                weight = init.initializer(init.XavierUniform(), (out_channels, in_channels, kernel_h, kernel_w),
+                                          cell.weight.dtype).init_data()
+                cell.weight.set_data(ops.transpose(weight, (0, 2, 3, 1)))
+            elif isinstance(cell, nn.Conv2d):
                 cell.weight.set_data(
                     init.initializer(init.XavierUniform(), cell.weight.shape, cell.weight.dtype))
 
+    def _set_compute_type(self) -> None:
+        """Run the convs in the compute type and keep the batch norms in float32."""
+        for _, cell in self.cells_and_names():
+            if isinstance(cell, nn.Conv2d):
+                cell.to_float(self.dtype)
+            elif isinstance(cell, nn.BatchNorm2d):
+                cell.to_float(mstype.float32)
+
+    def fuse(self) -> None:
+        """Fold every batch norm into its conv and merge the 1x1 convs reading the input of each Inception block,
+        for inference. Call it after the weights are loaded and before the model first runs in graph mode: the conv
+        kernels are scaled in place, and a graph already compiled for the model is reused and would still apply the
+        batch norms on top of them, so a compiled model raises a RuntimeError instead."""
+        if getattr(self, 'compile_cache', None):
+            raise RuntimeError('fuse() cannot be applied to a model that already has a compiled graph, which would '
+                               'keep applying the batch norms. Load its weights into a new model and fuse that one.')
+        cells = [cell for _, cell in self.cells_and_names()]
+        for cell in cells:
+            if isinstance(cell, BasicConv2d):
+                cell.fuse()
+        for cell in cells:
+            if isinstance(cell, InceptionBase):
+                cell.fuse()
+        if self.dtype != mstype.float32:
+            self._set_compute_type()
+        self._update_parameter_names()
+        self.fused = True
+
+    def _update_parameter_names(self) -> None:
+        """Name the parameters of cells inserted after construction by their full path."""
+        for name, param in self.parameters_and_names():
+            param.name = name
+
+    def export_fused(self, file_name: str, input_shape: Tuple[int, ...] = (1, 3, 299, 299),
+                     file_format: str = 'MINDIR') -> None:
+        """Export the fused inference graph for a fixed input shape, so that the backend can plan memory and fuse
+        operators over the whole static graph ahead of time. An unfused model is left as it is: a fused copy with
+        the same weights is exported instead."""
+        network = self
+        if not self.fused:
+            network = InceptionV4(self.num_classes, self.in_channels, data_format=self.data_format, dtype=self.dtype,
+                                  skip_init=True)
+            params = {name: Parameter(Tensor(param.asnumpy()), name=name)
+                      for name, param in self.parameters_and_names()}
+            load_param_into_net(network, params)
+            network.set_train(False)
+            network.fuse()
+        export(network, ops.Zeros()(input_shape, mstype.float32), file_name=file_name, file_format=file_format)
+
     def forward_features(self, x: Tensor) -> Tensor:
+        if self.data_format == 'NHWC':
+            x = ops.transpose(x, (0, 2, 3, 1))
+        if self.dtype != mstype.float32:
+            x = ops.cast(x, self.dtype)
         x = self.features(x)
         return x
 
     def forward_head(self, x: Tensor) -> Tensor:
         x = self.pool(x)
+        if self.dtype != mstype.float32:
+            x = ops.cast(x, mstype.float32)
         x = self.dropout(x)
         x = self.classifier(x)
         return x
@@ -297,14 +445,25 @@ class InceptionV4(nn.Cell):
         return x
 
 
+def _nchw_to_nhwc(param_dict):
+    """Transpose the conv kernels of an NCHW checkpoint from (out, in, h, w) to (out, h, w, in)."""
+    for name, param in param_dict.items():
+        if name.endswith('conv.weight'):
+            param.set_data(ops.transpose(param, (0, 2, 3, 1)), slice_shape=True)
+    return param_dict
+
+
 @register_model
 def inception_v4(pretrained: bool = False, num_classes: int = 1000, in_channels=3, **kwargs) -> InceptionV4:
-    """Get InceptionV4 model.
+    """Get InceptionV4 model. Call `fuse()` on the returned model once its weights are loaded to fold the batch
+     norms into the convs for inference.
      Refer to the base class `models.InceptionV4` for more details."""
     default_cfg = default_cfgs['inception_v4']
+    kwargs.setdefault('skip_init', pretrained)
     model = InceptionV4(num_classes=num_classes, in_channels=in_channels, **kwargs)
 
     if pretrained:
-        load_pretrained(model, default_cfg, num_classes=num_classes, in_channels=in_channels)
+        filter_fn = _nchw_to_nhwc if model.data_format == 'NHWC' else None
+        load_pretrained(model, default_cfg, num_classes=num_classes, in_channels=in_channels, filter_fn=filter_fn)
 
     return model
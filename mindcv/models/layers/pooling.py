@@ -8,11 +8,13 @@ class GlobalAvgPooling(nn.Cell):
     GlobalAvgPooling, same as torch.nn.AdaptiveAvgPool2d when output shape is 1
     """
     def __init__(self,
-                 keep_dims: bool = False
+                 keep_dims: bool = False,
+                 data_format: str = 'NCHW'
                  ) -> None:
         super().__init__()
         self.keep_dims = keep_dims
+        self.spatial_axis = (2, 3) if data_format == 'NCHW' else (1, 2)
 
     def construct(self, x):
-        x = ops.mean(x, axis=(2, 3), keep_dims=self.keep_dims)
+        x = ops.mean(x, axis=self.spatial_axis, keep_dims=self.keep_dims)
         return x
@@ -4,11 +4,12 @@ sys.path.append('.')
 import pytest
 
 import numpy as np
-from mindspore import Tensor
+from mindspore import Tensor, Parameter, load_param_into_net
 import mindspore as ms
 import mindspore
 from mindcv import list_models, list_modules
 from mindcv.models import create_model, model_entrypoint, is_model_in_modules, is_model_pretrained
+from mindcv.models.inception_v4 import _nchw_to_nhwc
 from mindcv.loss import create_loss
 from mindcv.optim import create_optimizer
 from mindspore.nn import TrainOneStepCell, WithLossCell
@@ -102,6 +103,105 @@ def test_is_model_pretrained():
 
     assert num_pretrained > 0, 'No pretrained models'
 
+
+def _copy_params(model):
+    return {name: Parameter(Tensor(param.asnumpy()), name=name) for name, param in model.parameters_and_names()}
+
+
+def test_inception_v4_nhwc():
+    if ms.get_context('device_target') != 'GPU':
+        pytest.skip('NHWC conv and batch norm are only supported on GPU')
+    model = create_model('inception_v4', num_classes=10)
+    model_nhwc = create_model('inception_v4', num_classes=10, data_format='NHWC')
+    load_param_into_net(model_nhwc, _nchw_to_nhwc(_copy_params(model)))
+    model.set_train(False)
+    model_nhwc.set_train(False)
+
+    dummy_input = Tensor(np.random.rand(2, 3, 139, 139), dtype=mindspore.float32)
+    y = model(dummy_input).asnumpy()
+    y_nhwc = model_nhwc(dummy_input).asnumpy()
+    assert np.allclose(y, y_nhwc, rtol=1e-3, atol=1e-3), 'NHWC logits do not match NCHW'
+
+
+def _randomize_batch_norms(model):
+    # non-trivial batch norm statistics, so that folding them changes the conv weights
+    for name, param in model.parameters_and_names():
+        if name.endswith(('gamma', 'beta', 'moving_mean', 'moving_variance')):
+            param.set_data(Tensor(np.random.uniform(0.5, 1.5, param.shape), dtype=mindspore.float32))
+
+
+@pytest.mark.parametrize('data_format', ['NCHW', 'NHWC'])
+def test_inception_v4_fuse(data_format):
+    if data_format == 'NHWC' and ms.get_context('device_target') != 'GPU':
+        pytest.skip('NHWC conv and batch norm are only supported on GPU')
+    model = create_model('inception_v4', num_classes=10, data_format=data_format)
+    _randomize_batch_norms(model)
+    fused = create_model('inception_v4', num_classes=10, data_format=data_format)
+    load_param_into_net(fused, _copy_params(model))
+    model.set_train(False)
+    fused.set_train(False)
+    fused.fuse()
+
+    dummy_input = Tensor(np.random.rand(2, 3, 139, 139), dtype=mindspore.float32)
+    y = model(dummy_input).asnumpy()
+    y_fused = fused(dummy_input).asnumpy()
+    assert np.allclose(y, y_fused, rtol=1e-3, atol=1e-3), 'logits changed after fuse'
+    if ms.get_context('mode') == ms.GRAPH_MODE:
+        with pytest.raises(RuntimeError):
+            model.fuse()
+
+
+def test_inception_v4_fuse_checkpoint(tmp_path):
+    model = create_model('inception_v4', num_classes=10)
+    _randomize_batch_norms(model)
+    checkpoint_path = str(tmp_path / 'inception_v4.ckpt')
+    ms.save_checkpoint(model, checkpoint_path)
+    fused = create_model('inception_v4', num_classes=10, checkpoint_path=checkpoint_path)
+    model.set_train(False)
+    fused.set_train(False)
+    fused.fuse()
+
+    dummy_input = Tensor(np.random.rand(2, 3, 139, 139), dtype=mindspore.float32)
+    y = model(dummy_input).asnumpy()
+    y_fused = fused(dummy_input).asnumpy()
+    assert np.allclose(y, y_fused, rtol=1e-3, atol=1e-3), 'logits changed after fusing a loaded checkpoint'
+
+
+def test_inception_v4_skip_init():
+    # std of XavierUniform for the 384 -> 96 1x1 conv of branch_0 in the first InceptionA block
+    xavier_std = math.sqrt(2 / (384 + 96))
+    model = create_model('inception_v4', num_classes=10)
+    weight = model.features[1].branch_0.conv.weight.asnumpy()
+    assert abs(weight.std() - xavier_std) < 0.1 * xavier_std, 'convs are not Xavier initialized'
+    model = create_model('inception_v4', num_classes=10, skip_init=True)
+    weight = model.features[1].branch_0.conv.weight.asnumpy()
+    assert abs(weight.std() - xavier_std) > 0.1 * xavier_std, 'skip_init still ran the Xavier init'
+
+
+def test_inception_v4_float16():
+    if ms.get_context('device_target') == 'CPU':
+        pytest.skip('float16 convs are not supported on CPU')
+    model = create_model('inception_v4', num_classes=10)
+    _randomize_batch_norms(model)
+    model_fp16 = create_model('inception_v4', num_classes=10, dtype=mindspore.float16)
+    load_param_into_net(model_fp16, _copy_params(model))
+    fused_fp16 = create_model('inception_v4', num_classes=10, dtype=mindspore.float16)
+    load_param_into_net(fused_fp16, _copy_params(model))
+    model.set_train(False)
+    model_fp16.set_train(False)
+    fused_fp16.set_train(False)
+    fused_fp16.fuse()
+
+    dummy_input = Tensor(np.random.rand(2, 3, 139, 139), dtype=mindspore.float32)
+    y = model(dummy_input).asnumpy()
+    y_fp16 = model_fp16(dummy_input).asnumpy()
+    y_fused_fp16 = fused_fp16(dummy_input).asnumpy()
+    assert y_fp16.dtype == np.float32, 'float16 model must return float32 logits'
+    atol = 1e-2 * np.abs(y).max()
+    assert np.allclose(y, y_fp16, rtol=1e-2, atol=atol), 'float16 logits do not match float32'
+    assert np.allclose(y, y_fused_fp16, rtol=1e-2, atol=atol), 'fused float16 logits do not match float32'
+
+
 if __name__== '__main__':
     test_model_forward('pnasnet')
     '''